@@ -5,7 +5,7 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
@@ -78,46 +78,58 @@ activities = {
 }
 
 
+def get_activities_db():
+    """Provide the activity database to route handlers"""
+    return activities
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
-    return activities
+def get_activities(db: dict = Depends(get_activities_db)):
+    return db
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+def signup_for_activity(activity_name: str, email: str,
+                        db: dict = Depends(get_activities_db)):
     """Sign up a student for an activity"""
     # Validate activity exists
-    if activity_name not in activities:
+    if activity_name not in db:
         raise HTTPException(status_code=404, detail="Activity not found")
 
     # Validate student is not already signed up
-    if email in activities[activity_name]["participants"]:
+    if email in db[activity_name]["participants"]:
         raise HTTPException(status_code=400, detail="Student already signed up for this activity")
     
     # Get the specific activity
-    activity = activities[activity_name]
+    activity = db[activity_name]
 
     # Add student
     activity["participants"].append(email)
-    return {"message": f"Signed up {email} for {activity_name}"}
+    return {"message": f"Signed up {email} for {activity_name}",
+            "participants": activity["participants"]}
 
 
 @app.post("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+def unregister_from_activity(activity_name: str, email: str,
+                             db: dict = Depends(get_activities_db)):
     """Unregister a student from an activity"""
     # Validate activity exists
-    if activity_name not in activities:
+    if activity_name not in db:
         raise HTTPException(status_code=404, detail="Activity not found")
 
     # Validate student is signed up
-    if email not in activities[activity_name]["participants"]:
+    if email not in db[activity_name]["participants"]:
         raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
 
+    # Get the specific activity
+    activity = db[activity_name]
+
     # Remove student
-    activities[activity_name]["participants"].remove(email)
-    return {"message": f"Unregistered {email} from {activity_name}"}
+    activity["participants"].remove(email)
+    return {"message": f"Unregistered {email} from {activity_name}",
+            "participants": activity["participants"]}
@@ -2,127 +2,198 @@
 Tests for the High School Activities API
 """
 
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
+from pydantic import BaseModel
 
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from app import app, activities as real_activities, get_activities_db
+
+# Canonical initial state of the in-memory activity database
+_ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Basketball Team": {
+        "description": "Competitive basketball team for all skill levels",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15,
+        "participants": ["james@mergington.edu"]
+    },
+    "Tennis Club": {
+        "description": "Learn tennis techniques and play matches",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:00 PM",
+        "max_participants": 10,
+        "participants": ["sarah@mergington.edu", "alex@mergington.edu"]
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and sculpture",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 18,
+        "participants": ["isabella@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Perform in theatrical productions and workshops",
+        "schedule": "Thursdays, 3:30 PM - 5:30 PM",
+        "max_participants": 25,
+        "participants": ["lucas@mergington.edu", "grace@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Develop argumentation and public speaking skills",
+        "schedule": "Mondays and Fridays, 3:30 PM - 4:30 PM",
+        "max_participants": 16,
+        "participants": ["ryan@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore scientific concepts",
+        "schedule": "Fridays, 4:00 PM - 5:00 PM",
+        "max_participants": 22,
+        "participants": ["zoe@mergington.edu", "marcus@mergington.edu"]
+    }
+}
+
+
+class ActivitySchema(BaseModel):
+    """Fields and types every activity is expected to expose"""
+    description: str
+    schedule: str
+    max_participants: int
+    participants: list[str]
 
-from app import app
 
-@pytest.fixture
+# Emails and query params reused across tests
+NEW_STUDENT = "newstudent@mergington.edu"
+MICHAEL = "michael@mergington.edu"
+NEW_STUDENT_PARAMS = {"email": NEW_STUDENT}
+MICHAEL_PARAMS = {"email": MICHAEL}
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+    """Create a single test client shared by the whole test session"""
+    with TestClient(app) as c:
+        yield c
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    # Import after adding to path
-    from app import activities
-    
-    # Store original activities
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball team for all skill levels",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis techniques and play matches",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": ["sarah@mergington.edu", "alex@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and sculpture",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["isabella@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in theatrical productions and workshops",
-            "schedule": "Thursdays, 3:30 PM - 5:30 PM",
-            "max_participants": 25,
-            "participants": ["lucas@mergington.edu", "grace@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop argumentation and public speaking skills",
-            "schedule": "Mondays and Fridays, 3:30 PM - 4:30 PM",
-            "max_participants": 16,
-            "participants": ["ryan@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Fridays, 4:00 PM - 5:00 PM",
-            "max_participants": 22,
-            "participants": ["zoe@mergington.edu", "marcus@mergington.edu"]
+@pytest_asyncio.fixture
+async def async_client():
+    """Create an async client for tests that chain several requests"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+def _fresh_activities():
+    """Build an independent copy of the initial activity database"""
+    return {
+        name: {
+            "description": details["description"],
+            "schedule": details["schedule"],
+            "max_participants": details["max_participants"],
+            "participants": details["participants"][:],
         }
+        for name, details in _ORIGINAL_ACTIVITIES.items()
     }
-    
-    yield
-    
-    # Reset activities after test
-    activities.clear()
-    activities.update(original_activities)
+
+
+def _reset_activities(state):
+    """Rebuild a database in place from the initial activity data"""
+    state.clear()
+    state.update(_fresh_activities())
+
+
+@pytest.fixture(scope="class", autouse=True)
+def class_activities():
+    """Give each test class its own activity database via a dependency override
+
+    Built once per class so the whole class can share it; run the suite with
+    ``pytest -n auto --dist=loadscope`` to keep each class on one worker.
+    """
+    state = _fresh_activities()
+    app.dependency_overrides[get_activities_db] = lambda: state
+    yield state
+    app.dependency_overrides.pop(get_activities_db, None)
+
+
+@pytest.fixture(autouse=True)
+def activities(request, class_activities):
+    """Undo changes a test made to the class database
+
+    Tests marked ``readonly`` skip the participant snapshot and restore; their
+    only teardown cost is one equality check against the template, which
+    fails the test if the mark turns out to be wrong.
+    """
+    if request.node.get_closest_marker("readonly"):
+        yield class_activities
+        if class_activities != _ORIGINAL_ACTIVITIES:
+            # Reset before failing so a wrongly marked test cannot leak state
+            _reset_activities(class_activities)
+            pytest.fail("test marked readonly changed the activity database")
+        return
+
+    participants = {
+        name: details["participants"][:]
+        for name, details in class_activities.items()
+    }
+    yield class_activities
+    for name, saved in participants.items():
+        class_activities[name]["participants"][:] = saved
+    # Fall back to a full rebuild if anything beyond participants changed
+    if class_activities != _ORIGINAL_ACTIVITIES:
+        _reset_activities(class_activities)
+
+
+@pytest.fixture(scope="class")
+def activities_snapshot(client, class_activities):
+    """Fetch the GET /activities payload once per class from the overridden database"""
+    response = client.get("/activities")
+    response.raise_for_status()
+    return response.json()
 
 
 class TestGetActivities:
     """Test cases for GET /activities endpoint"""
 
-    def test_get_all_activities(self, client):
+    @pytest.mark.readonly
+    def test_get_all_activities(self, activities_snapshot):
         """Test that we can retrieve all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        
-        data = response.json()
+        data = activities_snapshot
         assert isinstance(data, dict)
         assert len(data) == 9
+        assert set(data) == set(_ORIGINAL_ACTIVITIES)
         assert "Chess Club" in data
         assert "Programming Class" in data
 
-    def test_activities_have_required_fields(self, client):
+    @pytest.mark.readonly
+    @pytest.mark.parametrize("activity_name", list(_ORIGINAL_ACTIVITIES))
+    def test_activities_have_required_fields(self, activities_snapshot, activity_name):
         """Test that each activity has required fields"""
-        response = client.get("/activities")
-        activities = response.json()
-        
-        for activity_name, activity_details in activities.items():
-            assert "description" in activity_details
-            assert "schedule" in activity_details
-            assert "max_participants" in activity_details
-            assert "participants" in activity_details
-            assert isinstance(activity_details["participants"], list)
-
-    def test_activities_have_participants(self, client):
+        assert activity_name in activities_snapshot
+        activity_details = activities_snapshot[activity_name]
+        ActivitySchema.model_validate(activity_details, strict=True)
+
+    @pytest.mark.readonly
+    def test_activities_have_participants(self, activities_snapshot):
         """Test that activities have initial participants"""
-        response = client.get("/activities")
-        activities = response.json()
-        
-        chess_club = activities["Chess Club"]
+        chess_club = activities_snapshot["Chess Club"]
         assert len(chess_club["participants"]) == 2
-        assert "michael@mergington.edu" in chess_club["participants"]
+        assert MICHAEL in chess_club["participants"]
 
 
 class TestSignupEndpoint:
@@ -132,71 +203,57 @@ class TestSignupEndpoint:
         """Test successful signup for an activity"""
         response = client.post(
             "/activities/Chess Club/signup",
-            params={"email": "newstudent@mergington.edu"}
+            params=NEW_STUDENT_PARAMS
         )
         
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
+        assert NEW_STUDENT in data["message"]
 
     def test_signup_updates_participant_list(self, client):
         """Test that signup updates the participant list"""
-        email = "newstudent@mergington.edu"
         
         # Sign up
-        client.post("/activities/Chess Club/signup", params={"email": email})
+        response = client.post("/activities/Chess Club/signup", params=NEW_STUDENT_PARAMS)
+        assert response.status_code == 200
         
         # Verify participant was added
-        response = client.get("/activities")
-        activities = response.json()
-        assert email in activities["Chess Club"]["participants"]
-        assert len(activities["Chess Club"]["participants"]) == 3
-
-    def test_signup_duplicate_email_fails(self, client):
-        """Test that signing up with duplicate email fails"""
-        response = client.post(
-            "/activities/Chess Club/signup",
-            params={"email": "michael@mergington.edu"}
-        )
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert "already signed up" in data["detail"]
-
-    def test_signup_nonexistent_activity_fails(self, client):
-        """Test that signing up for nonexistent activity fails"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup",
-            params={"email": "student@mergington.edu"}
-        )
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"]
+        participants = response.json()["participants"]
+        assert NEW_STUDENT in participants
+        assert len(participants) == 3
 
-    def test_signup_multiple_activities(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_multiple_activities(self, async_client):
         """Test that a student can sign up for multiple activities"""
-        email = "newstudent@mergington.edu"
         
-        response1 = client.post(
+        response1 = await async_client.post(
             "/activities/Chess Club/signup",
-            params={"email": email}
+            params=NEW_STUDENT_PARAMS
         )
-        response2 = client.post(
+        response2 = await async_client.post(
             "/activities/Programming Class/signup",
-            params={"email": email}
+            params=NEW_STUDENT_PARAMS
         )
         
         assert response1.status_code == 200
         assert response2.status_code == 200
         
         # Verify both signups
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        assert email in activities["Chess Club"]["participants"]
-        assert email in activities["Programming Class"]["participants"]
+        assert NEW_STUDENT in response1.json()["participants"]
+        assert NEW_STUDENT in response2.json()["participants"]
+
+
+    def test_signup_without_override_uses_real_database(self, client, monkeypatch):
+        """Test that the real dependency serves the module-level database"""
+        monkeypatch.delitem(app.dependency_overrides, get_activities_db)
+        chess_club = real_activities["Chess Club"]
+        monkeypatch.setitem(chess_club, "participants", chess_club["participants"][:])
+
+        response = client.post("/activities/Chess Club/signup", params=NEW_STUDENT_PARAMS)
+        assert response.status_code == 200
 
+        assert NEW_STUDENT in real_activities["Chess Club"]["participants"]
 
 class TestUnregisterEndpoint:
     """Test cases for POST /activities/{activity_name}/unregister endpoint"""
@@ -205,66 +262,64 @@ class TestUnregisterEndpoint:
         """Test successful unregister from an activity"""
         response = client.post(
             "/activities/Chess Club/unregister",
-            params={"email": "michael@mergington.edu"}
+            params=MICHAEL_PARAMS
         )
         
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
-        assert "michael@mergington.edu" in data["message"]
+        assert MICHAEL in data["message"]
 
-    def test_unregister_updates_participant_list(self, client):
+    def test_unregister_updates_participant_list(self, client, activities):
         """Test that unregister removes participant from list"""
-        email = "michael@mergington.edu"
         
         # Verify participant is there
-        response = client.get("/activities")
-        activities = response.json()
-        assert email in activities["Chess Club"]["participants"]
+        assert MICHAEL in activities["Chess Club"]["participants"]
         initial_count = len(activities["Chess Club"]["participants"])
         
         # Unregister
-        client.post("/activities/Chess Club/unregister", params={"email": email})
+        response = client.post("/activities/Chess Club/unregister", params=MICHAEL_PARAMS)
+        assert response.status_code == 200
         
         # Verify participant was removed
-        response = client.get("/activities")
-        activities = response.json()
-        assert email not in activities["Chess Club"]["participants"]
-        assert len(activities["Chess Club"]["participants"]) == initial_count - 1
+        participants = response.json()["participants"]
+        assert MICHAEL not in participants
+        assert len(participants) == initial_count - 1
 
-    def test_unregister_nonexistent_activity_fails(self, client):
-        """Test that unregistering from nonexistent activity fails"""
-        response = client.post(
-            "/activities/Nonexistent Club/unregister",
-            params={"email": "student@mergington.edu"}
-        )
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"]
-
-    def test_unregister_not_registered_fails(self, client):
-        """Test that unregistering when not signed up fails"""
-        response = client.post(
-            "/activities/Chess Club/unregister",
-            params={"email": "notstudent@mergington.edu"}
-        )
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert "not signed up" in data["detail"]
-
-    def test_signup_then_unregister(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_then_unregister(self, async_client):
         """Test signup followed by unregister"""
-        email = "newstudent@mergington.edu"
         activity = "Chess Club"
         
         # Sign up
-        client.post(f"/activities/{activity}/signup", params={"email": email})
-        response = client.get("/activities")
-        assert email in response.json()[activity]["participants"]
+        response = await async_client.post(f"/activities/{activity}/signup", params=NEW_STUDENT_PARAMS)
+        assert response.status_code == 200
+        assert NEW_STUDENT in response.json()["participants"]
         
         # Unregister
-        client.post(f"/activities/{activity}/unregister", params={"email": email})
-        response = client.get("/activities")
-        assert email not in response.json()[activity]["participants"]
+        response = await async_client.post(f"/activities/{activity}/unregister", params=NEW_STUDENT_PARAMS)
+        assert response.status_code == 200
+        assert NEW_STUDENT not in response.json()["participants"]
+
+
+class TestErrorResponses:
+    """Test cases for signup/unregister requests that should be rejected"""
+
+    @pytest.mark.parametrize("path,email,status_code,detail", [
+        pytest.param("/activities/Chess Club/signup", MICHAEL,
+                     400, "already signed up", id="signup-duplicate-email"),
+        pytest.param("/activities/Nonexistent Club/signup", "student@mergington.edu",
+                     404, "not found", id="signup-nonexistent-activity",
+                     marks=pytest.mark.readonly),
+        pytest.param("/activities/Nonexistent Club/unregister", "student@mergington.edu",
+                     404, "not found", id="unregister-nonexistent-activity",
+                     marks=pytest.mark.readonly),
+        pytest.param("/activities/Chess Club/unregister", "notstudent@mergington.edu",
+                     400, "not signed up", id="unregister-not-registered"),
+    ])
+    def test_request_fails(self, client, path, email, status_code, detail):
+        """Test that invalid requests return the expected error"""
+        response = client.post(path, params={"email": email})
+
+        assert response.status_code == status_code
+        assert detail in response.json()["detail"]